@@ -17,6 +17,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
+from network_utils import (
+    NetworkRules,
+    format_usage,
+    get_network_usage,
+    release_network_usage,
+    usage_delta,
+)
 
 
 logging.basicConfig(
@@ -60,6 +67,27 @@ def pytest_addoption(parser):
         action="store_true",
         help="Run tests in parallel across browsers",
     )
+    parser.addoption(
+        "--block-urls",
+        action="store",
+        default=None,
+        help="Comma-separated URL patterns to block, '*' is a wildcard",
+    )
+    parser.addoption(
+        "--block-resource-types",
+        action="store",
+        default=None,
+        help="Comma-separated resource types to block: image,font,stylesheet,script,media",
+    )
+    parser.addoption(
+        "--network-throttle",
+        action="store",
+        default=None,
+        help="Network throttling profile: slow-3g, fast-3g, 4g (Chrome/Edge only)",
+    )
+    parser.addini("block_urls", "URL patterns to block", type="linelist")
+    parser.addini("block_resource_types", "Resource types to block", type="linelist")
+    parser.addini("network_throttle", "Network throttling profile", default="")
 
 
 def update_browsers_in_html_report(report_path: str, browsers: list[str]):
@@ -224,6 +252,9 @@ def pytest_configure(config):
     config.stash[metadata_key]["Display Mode"] = (
         "headed" if config.getoption("headed") else "headless"
     )
+    config._network_rules = NetworkRules.from_config(config)
+    if config._network_rules:
+        config.stash[metadata_key]["Network Rules"] = config._network_rules.describe()
     if individual or subprocess:
         config.stash[metadata_key]["Browser Execution Mode"] = (
             "individual-browsers" if individual else "parallel-browsers"
@@ -283,6 +314,7 @@ def wait(driver, request):
 def driver(request, base_url, browser_name):
     headed = request.config.getoption("headed")
     browser = browser_name.lower()
+    network_rules = request.config._network_rules
 
     logging.info(
         f"Launching {browser.capitalize()} in {'headed' if headed else 'headless'} mode for tests."
@@ -291,27 +323,40 @@ def driver(request, base_url, browser_name):
         options = ChromeOptions()
         if not headed:
             options.add_argument("--headless")
+        network_rules.prepare_options(browser, options)
         driver = webdriver.Chrome(options=options)
 
     elif browser == "firefox":
         options = FirefoxOptions()
         if not headed:
             options.add_argument("--headless")
+        network_rules.prepare_options(browser, options)
         driver = webdriver.Firefox(options=options)
 
     elif browser == "edge":
         options = EdgeOptions()
         if not headed:
             options.add_argument("--headless")
+        network_rules.prepare_options(browser, options)
         driver = webdriver.Edge(options=options)
 
     else:
         raise ValueError(f"Unsupported browser: {browser_name}")
 
+    network_usage = network_rules.apply(browser, driver)
     driver.maximize_window()
     driver.get(base_url)
+    if network_usage:
+        # Attribute the base URL load here, before the first test snapshot
+        logging.info(
+            f"Network usage during {browser} session setup: "
+            f"{format_usage(network_usage.snapshot())}"
+        )
 
     yield driver
+    usage = release_network_usage(driver)
+    if usage:
+        logging.info(f"Network usage on {browser}: {format_usage(usage.snapshot())}")
     logging.info(f"Quitting {browser.capitalize()} browser.")
     driver.quit()
 
@@ -320,6 +365,18 @@ def pytest_html_report_title(report):
     report.title = "Automation Report"
 
 
+# This hook records network usage for each test when network rules are active
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    usage = get_network_usage(item.funcargs.get("driver", None))
+    before = usage.snapshot() if usage else None
+    yield
+    if usage:
+        delta = usage_delta(before, usage.snapshot())
+        item.user_properties.append(("network_usage", delta))
+        logging.info(f"[{item.name}] Network usage: {format_usage(delta)}")
+
+
 # This hook adds screenshots and driver URL to the HTML report on test failure
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -350,4 +407,11 @@ def pytest_runtest_makereport(item, call):
                 # Optionally add the page URL
                 extras.append(pytest_html.extras.url(driver.current_url))
 
+        if report.when == "call":
+            for name, value in item.user_properties:
+                if name == "network_usage":
+                    extras.append(
+                        pytest_html.extras.text(format_usage(value), name="Network")
+                    )
+
         report.extras = extras
@@ -0,0 +1,261 @@
+import re
+import json
+import pytest
+import logging
+import threading
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Throughput values are in bytes per second, latency in milliseconds.
+# The presets mirror the ones shipped with Chrome DevTools.
+THROTTLE_PROFILES = {
+    "slow-3g": {
+        "latency": 2000,
+        "download_throughput": 50000,
+        "upload_throughput": 50000,
+    },
+    "fast-3g": {
+        "latency": 563,
+        "download_throughput": 180000,
+        "upload_throughput": 84375,
+    },
+    "4g": {
+        "latency": 170,
+        "download_throughput": 1125000,
+        "upload_throughput": 1125000,
+    },
+}
+
+# CDP Network.setBlockedURLs only understands URL patterns, so resource
+# types are expanded into file extension patterns for every browser.
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "stylesheet": ["css"],
+    "script": ["js"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav", "m4a"],
+}
+
+CHROMIUM_LOGGING_PREFS = {"chrome": "goog:loggingPrefs", "edge": "ms:loggingPrefs"}
+
+# Active trackers keyed by WebDriver session id
+_trackers = {}
+
+
+def _split_values(values):
+    """Flattens ini line lists and comma-separated CLI values into one list."""
+    if isinstance(values, str):
+        values = [values]
+    items = [item.strip() for value in values or [] for item in value.split(",")]
+    return [item for item in items if item]
+
+
+def _pattern_to_regex(pattern):
+    # Same semantics as CDP Network.setBlockedURLs: the pieces between '*'
+    # must appear in order, and neither end of the URL is anchored
+    return re.compile(".*".join(re.escape(part) for part in pattern.split("*")))
+
+
+class NetworkRules:
+    """Blocking and throttling rules applied to every browser session."""
+
+    def __init__(self, url_patterns=None, resource_types=None, throttle=None):
+        self.resource_types = [t.lower() for t in resource_types or []]
+        unknown = set(self.resource_types) - set(RESOURCE_TYPE_EXTENSIONS)
+        if unknown:
+            raise pytest.UsageError(
+                f"Unsupported resource types: {', '.join(sorted(unknown))}. "
+                f"Choose from: {', '.join(RESOURCE_TYPE_EXTENSIONS)}"
+            )
+        throttle = throttle.lower() if throttle else None
+        if throttle and throttle not in THROTTLE_PROFILES:
+            raise pytest.UsageError(
+                f"Unsupported throttle profile: {throttle}. "
+                f"Choose from: {', '.join(THROTTLE_PROFILES)}"
+            )
+        self.throttle = throttle
+
+        self.url_patterns = list(url_patterns or [])
+        self.patterns = list(self.url_patterns)
+        for resource_type in self.resource_types:
+            for ext in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                # CDP patterns are case-sensitive, so cover upper-case files too
+                for variant in (ext, ext.upper()):
+                    self.patterns.append(f"*.{variant}")
+        self._regexes = [_pattern_to_regex(p) for p in self.patterns]
+
+    @classmethod
+    def from_config(cls, config):
+        """Reads the rules from the CLI, falling back to pytest.ini values."""
+
+        def option_or_ini(option, ini):
+            return config.getoption(option) or config.getini(ini)
+
+        rules = cls(
+            url_patterns=_split_values(option_or_ini("block_urls", "block_urls")),
+            resource_types=_split_values(
+                option_or_ini("block_resource_types", "block_resource_types")
+            ),
+            throttle=option_or_ini("network_throttle", "network_throttle") or None,
+        )
+        browsers = _split_values(config.getoption("browser").lower())
+        # Checked here so no browser is started before the run is rejected
+        if (
+            rules.patterns
+            and "firefox" in browsers
+            and not hasattr(WebDriver, "network")
+        ):
+            raise pytest.UsageError(
+                "Blocking URLs on Firefox needs WebDriver BiDi network support "
+                "(selenium>=4.32.0). Upgrade selenium or drop the block rules."
+            )
+        return rules
+
+    def __bool__(self):
+        return bool(self.patterns or self.throttle)
+
+    def describe(self):
+        parts = []
+        if self.url_patterns:
+            parts.append(f"URLs: {', '.join(self.url_patterns)}")
+        if self.resource_types:
+            parts.append(f"types: {', '.join(self.resource_types)}")
+        if self.throttle:
+            parts.append(f"throttle: {self.throttle}")
+        return "; ".join(parts) or "none"
+
+    def matches(self, url):
+        return any(regex.search(url) for regex in self._regexes)
+
+    def prepare_options(self, browser, options):
+        """Adds the capabilities needed before the browser is launched."""
+        if not self:
+            return
+
+        if browser in CHROMIUM_LOGGING_PREFS:
+            # Performance log is where blocked requests and bytes show up
+            options.set_capability(
+                CHROMIUM_LOGGING_PREFS[browser], {"performance": "ALL"}
+            )
+        elif browser == "firefox":
+            # WebDriver BiDi is required for request interception
+            options.set_capability("webSocketUrl", True)
+
+    def apply(self, browser, driver):
+        """Installs the rules on a started driver and begins tracking usage."""
+        if not self:
+            return None
+
+        tracker = NetworkUsage(browser, driver)
+        if browser in CHROMIUM_LOGGING_PREFS:
+            driver.execute_cdp_cmd("Network.enable", {})
+            if self.patterns:
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": self.patterns}
+                )
+            if self.throttle:
+                profile = THROTTLE_PROFILES[self.throttle]
+                driver.execute_cdp_cmd(
+                    "Network.emulateNetworkConditions",
+                    {
+                        "offline": False,
+                        "latency": profile["latency"],
+                        "downloadThroughput": profile["download_throughput"],
+                        "uploadThroughput": profile["upload_throughput"],
+                    },
+                )
+        elif browser == "firefox":
+            if self.throttle:
+                logging.warning(
+                    "Network throttling is not supported on Firefox. Ignoring it."
+                )
+            if self.patterns:
+                self._intercept_firefox(driver, tracker)
+
+        _trackers[driver.session_id] = tracker
+        logging.info(f"Network rules applied on {browser}: {self.describe()}")
+        return tracker
+
+    def _intercept_firefox(self, driver, tracker):
+        # BiDi URL patterns have no wildcards, so every request is paused and
+        # matched here. A paused request must always be released again.
+        def on_request(request):
+            try:
+                if self.matches(request.url):
+                    request.fail_request()
+                    tracker.add_blocked()
+                    return
+            except Exception as e:
+                logging.error(f"Request interception failed for {request.url}: {e}")
+            request.continue_request()
+
+        driver.network.add_request_handler("before_request", on_request)
+
+
+class NetworkUsage:
+    """Running totals of blocked requests and transferred bytes for a driver."""
+
+    def __init__(self, browser, driver):
+        self.browser = browser
+        self.driver = driver
+        self.blocked_requests = 0
+        self._lock = threading.Lock()
+        # Only Chromium exposes transferred bytes through the performance log
+        self.bytes_transferred = 0 if browser in CHROMIUM_LOGGING_PREFS else None
+
+    def add_blocked(self):
+        # BiDi callbacks run on their own threads
+        with self._lock:
+            self.blocked_requests += 1
+
+    def poll(self):
+        """Drains the Chromium performance log into the running totals."""
+        if self.browser not in CHROMIUM_LOGGING_PREFS:
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logging.error(f"Could not read performance log: {e}")
+            return
+
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            # "inspector" is the reason given for Network.setBlockedURLs;
+            # csp, mixed-content and the like are the page's own blocking
+            if (
+                method == "Network.loadingFailed"
+                and params.get("blockedReason") == "inspector"
+            ):
+                self.blocked_requests += 1
+            elif method == "Network.loadingFinished":
+                self.bytes_transferred += int(params.get("encodedDataLength", 0))
+
+    def snapshot(self):
+        self.poll()
+        return {
+            "blocked_requests": self.blocked_requests,
+            "bytes_transferred": self.bytes_transferred,
+        }
+
+
+def get_network_usage(driver):
+    return _trackers.get(getattr(driver, "session_id", None))
+
+
+def release_network_usage(driver):
+    return _trackers.pop(getattr(driver, "session_id", None), None)
+
+
+def usage_delta(before, after):
+    return {
+        key: None if after[key] is None else after[key] - before[key] for key in after
+    }
+
+
+def format_usage(usage):
+    transferred = usage["bytes_transferred"]
+    return (
+        f"requests blocked: {usage['blocked_requests']}, bytes transferred: "
+        f"{'n/a' if transferred is None else transferred}"
+    )
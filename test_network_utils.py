@@ -0,0 +1,186 @@
+import json
+import pytest
+import network_utils
+from network_utils import (
+    NetworkRules,
+    NetworkUsage,
+    _split_values,
+    format_usage,
+    usage_delta,
+)
+
+
+class FakeChromeDriver:
+    def __init__(self, events):
+        self.events = events
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        entries = [{"message": json.dumps({"message": event})} for event in self.events]
+        self.events = []
+        return entries
+
+
+class FakeRequest:
+    def __init__(self, url):
+        self.url = url
+        self.outcome = None
+
+    def fail_request(self):
+        self.outcome = "failed"
+
+    def continue_request(self):
+        self.outcome = "continued"
+
+
+class FakeNetwork:
+    def add_request_handler(self, event, callback):
+        self.event = event
+        self.callback = callback
+
+
+class FakeFirefoxDriver:
+    session_id = "firefox-session"
+
+    def __init__(self):
+        self.network = FakeNetwork()
+
+
+class FakeConfig:
+    def __init__(self, **options):
+        self.options = options
+
+    def getoption(self, name):
+        return self.options.get(name)
+
+    def getini(self, name):
+        return []
+
+
+def loading_failed(reason):
+    return {"method": "Network.loadingFailed", "params": {"blockedReason": reason}}
+
+
+def loading_finished(size):
+    return {
+        "method": "Network.loadingFinished",
+        "params": {"encodedDataLength": size},
+    }
+
+
+def test_split_values_accepts_ini_lines_and_commas():
+    assert _split_values(["a, b", "c", " ", ""]) == ["a", "b", "c"]
+    assert _split_values("image,font") == ["image", "font"]
+    assert _split_values(None) == []
+
+
+@pytest.mark.parametrize(
+    "pattern, url, expected",
+    [
+        ("*google-analytics.com*", "https://www.google-analytics.com/a.js", True),
+        ("*google-analytics.com*", "https://example.com/", False),
+        ("https://x.com/a?b=1", "https://x.com/a?b=1", True),
+        ("https://x.com/a?b=1", "https://x.com/ab=1", False),
+        ("google-analytics.com", "https://www.google-analytics.com/a.js", True),
+        ("*.css", "https://x.com/site.css?v=2", True),
+        ("*.js", "https://x.com/data.json", True),
+    ],
+)
+def test_url_patterns_use_cdp_wildcards(pattern, url, expected):
+    assert NetworkRules(url_patterns=[pattern]).matches(url) is expected
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://x.com/logo.png", True),
+        ("https://x.com/logo.png?v=3", True),
+        ("https://x.com/img.PNG", True),
+        ("https://x.com/font.woff2", False),
+        ("https://x.com/page.html", False),
+    ],
+)
+def test_resource_types_match_file_extensions(url, expected):
+    assert NetworkRules(resource_types=["Image"]).matches(url) is expected
+
+
+def test_invalid_rules_are_usage_errors():
+    with pytest.raises(pytest.UsageError, match="resource types: video"):
+        NetworkRules(resource_types=["video"])
+    with pytest.raises(pytest.UsageError, match="throttle profile: 3g"):
+        NetworkRules(throttle="3g")
+
+
+def test_firefox_blocking_without_bidi_network_is_a_usage_error(monkeypatch):
+    config = FakeConfig(browser="chrome,firefox", block_urls="*ads*")
+    monkeypatch.delattr(network_utils.WebDriver, "network")
+
+    with pytest.raises(pytest.UsageError, match="selenium>=4.32.0"):
+        NetworkRules.from_config(config)
+    assert NetworkRules.from_config(FakeConfig(browser="chrome", block_urls="*ads*"))
+
+
+def test_rules_describe_configured_values():
+    rules = NetworkRules(
+        url_patterns=["*ads*"], resource_types=["image", "font"], throttle="Slow-3G"
+    )
+    assert rules.describe() == "URLs: *ads*; types: image, font; throttle: slow-3g"
+    assert not NetworkRules()
+    assert NetworkRules().describe() == "none"
+
+
+def test_poll_counts_only_requests_blocked_by_rules():
+    driver = FakeChromeDriver(
+        [
+            loading_failed("inspector"),
+            loading_failed("csp"),
+            loading_failed("mixed-content"),
+            {"method": "Network.loadingFailed", "params": {"errorText": "net::ERR"}},
+            loading_finished(1200),
+            loading_finished(300),
+        ]
+    )
+    usage = NetworkUsage("chrome", driver)
+    assert usage.snapshot() == {"blocked_requests": 1, "bytes_transferred": 1500}
+
+    driver.events = [loading_failed("inspector"), loading_finished(100)]
+    assert usage.snapshot() == {"blocked_requests": 2, "bytes_transferred": 1600}
+
+
+def test_usage_delta_and_format():
+    delta = usage_delta(
+        {"blocked_requests": 2, "bytes_transferred": 100},
+        {"blocked_requests": 5, "bytes_transferred": 400},
+    )
+    assert delta == {"blocked_requests": 3, "bytes_transferred": 300}
+    assert format_usage(delta) == "requests blocked: 3, bytes transferred: 300"
+
+    firefox = {"blocked_requests": 1, "bytes_transferred": None}
+    assert usage_delta(firefox, firefox) == {
+        "blocked_requests": 0,
+        "bytes_transferred": None,
+    }
+    assert format_usage(firefox) == "requests blocked: 1, bytes transferred: n/a"
+
+
+def test_firefox_handler_blocks_matches_and_continues_the_rest():
+    driver = FakeFirefoxDriver()
+    usage = NetworkRules(url_patterns=["*ads*"]).apply("firefox", driver)
+    blocked, allowed = FakeRequest("https://ads.x.com/"), FakeRequest("https://x.com/")
+
+    driver.network.callback(blocked)
+    driver.network.callback(allowed)
+
+    assert driver.network.event == "before_request"
+    assert (blocked.outcome, allowed.outcome) == ("failed", "continued")
+    assert usage.snapshot()["blocked_requests"] == 1
+
+
+def test_firefox_handler_continues_request_when_matching_fails():
+    driver = FakeFirefoxDriver()
+    NetworkRules(url_patterns=["*ads*"]).apply("firefox", driver)
+    request = FakeRequest(None)
+
+    driver.network.callback(request)
+
+    assert request.outcome == "continued"